@@ -6,51 +6,172 @@ pour différentes configurations de serres selon les zones vent/neige.
 """
 
 from pathlib import Path
+import itertools
 import json
+import os
 import pandas as pd
 import numpy as np
 import functools
 from concurrent.futures import ThreadPoolExecutor
-import threading
 import logging
 import argparse
 import warnings
 
 import dash
-from dash import Dash, html, dcc, Output, Input
+from dash import Dash, html, dcc, Output, Input, State
+
+# orjson (optionnel) parse le GeoJSON multi-Mo 2 à 5 fois plus vite que json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 import plotly.express as px
 import plotly.graph_objects as go
 
 from config import (
-    check_required_files, 
-    GEOJSON_PATH, ZONES_PATH, RULES_PATH,
+    check_required_files,
+    setup_logging as configure_logging,
+    GEOJSON_PATH, GEOJSON_SIMPLIFIED_PATH, ZONES_PATH, RULES_PATH,
     ZONES_DTYPES, RULES_DTYPES
 )
-from utils import compute_centroids, build_modern_color_palette
+from utils import compute_centroids, build_modern_color_palette, simplify_geojson
+
+# Réglages Plotly constants, partagés par toutes les figures : définis une
+# seule fois au lieu d'être reconstruits à chaque création de choroplèthe
+_GEOS_CFG = dict(
+    showframe=False,
+    showcoastlines=False,
+    projection_type="mercator",
+    lonaxis_range=[-5.5, 9.5],
+    lataxis_range=[41.0, 51.5],
+    bgcolor='#ffffff',
+    showocean=True,
+    oceancolor='#ffffff',
+    showlakes=True,
+    lakecolor='#ffffff',
+    showland=True,
+    landcolor='#ffffff',
+    resolution=50
+)
+
+_LAYOUT_CFG = dict(
+    margin=dict(l=10, r=10, t=40, b=10),
+    plot_bgcolor='#ffffff',
+    paper_bgcolor='#ffffff',
+    height=None,
+    showlegend=True,
+    uirevision='constant',
+    autosize=True,
+    dragmode='pan',
+    legend=dict(
+        orientation="h",
+        yanchor="top",
+        y=1.02,
+        xanchor="center",
+        x=0.5,
+        bgcolor="rgba(255,255,255,0.95)",
+        bordercolor="#e2e8f0",
+        borderwidth=1,
+        font=dict(size=12, color="#1e293b")
+    )
+)
 
+# Champs affichés dans le panneau « Détails configuration »
+_DETAIL_FIELDS = ("Type_Serre", "Hauteur_Poteau", "Largeur", "Toiture", "Facade", "Traverse")
+_DETAIL_DEFAULTS = {f: "—" for f in _DETAIL_FIELDS}
+
+# Fabriques de dicts bruts au schéma JSON des composants Dash : les arbres
+# pré-calculés (légende, statistiques) sont déjà dans leur forme sérialisée,
+# sans passer par l'instanciation et la validation de chaque Component
+def _div(children=None, **props):
+    if children is not None:
+        props["children"] = children
+    return {"type": "Div", "namespace": "dash_html_components", "props": props}
+
+def _span(children=None, **props):
+    if children is not None:
+        props["children"] = children
+    return {"type": "Span", "namespace": "dash_html_components", "props": props}
+
+@functools.lru_cache(maxsize=None)
+def _alt_label(value: int) -> str:
+    """Libellé « N m » d'une altitude, mémoïsé (mêmes altitudes d'une combinaison à l'autre)."""
+    return f"{value} m"
+
+# Panneaux statiques : contenu identique à chaque affichage, construit une
+# seule fois à l'import plutôt qu'à chaque callback
+USAGE_PANEL = html.Div([
+    html.P("Calculs: Catégorie de terrain II (EN 13031)", style={'color': '#374151', 'margin': '0 0 6px 0'}),
+    html.P("Catégorie I: étude BE obligatoire", style={'color': '#b91c1c', 'fontWeight': '600', 'margin': '0 0 8px 0'}),
+    html.P("Altitude max = Vent × Neige pour la configuration affichée.", style={'color': '#6b7280', 'margin': '0 0 4px 0'}),
+    html.P("Outil d'aide commerciale — ne remplace pas une note de calcul.", style={'color': '#6b7280', 'margin': 0})
+])
+
+CONDITIONS_PANEL = html.Div([
+    html.Div("Portée", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Carte d'aide à la vente indiquant l'altitude maximale admissible par département pour la configuration sélectionnée."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Hypothèses de calcul", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Norme EN 13031."),
+        html.Li("Catégorie de terrain II (site relativement plat et dégagé)."),
+        html.Li("Sans particularités locales ni corrections d'effet de site."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Définitions", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Altitude max: valeur indicative issue du croisement Zones Vent × Neige pour la configuration affichée."),
+        html.Li("Non admissible: aucune règle ne permet un entraxe conforme pour cette configuration dans le département."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Cas non couverts / limites", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Catégorie de terrain I (sites très exposés: littoral, plateaux ouverts, etc.)."),
+        html.Li("Relief marqué, couloirs de vent, bords de falaises, effets d'obstacles/bâtiments voisins."),
+        html.Li("Microclimats, altitude du site élevée, règles locales particulières, matériaux/charges spécifiques."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Responsabilités", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Outil d'aide commerciale; ne remplace pas une note de calcul."),
+        html.Li("En cas de doute, de site exposé (Cat. I) ou de condition non couverte, solliciter le bureau d'études avant toute offre."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Données et mise à jour", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li("Zones Vent/Neige selon sources en vigueur à la date de mise à jour indiquée."),
+        html.Li("Les évolutions réglementaires peuvent modifier les résultats; vérifier la version la plus récente."),
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Avertissement important", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
+    html.Ul([
+        html.Li(html.Span([html.Span("Catégorie I: ", style={'fontWeight': '700', 'color': '#b91c1c'}), "la carte n'est pas applicable; étude BE obligatoire avant toute décision."]))
+    ], style={'margin': 0, 'paddingLeft': '18px'}),
+    html.Div("Dernière mise à jour: JJ/MM/AAAA", style={'marginTop': '10px', 'color': '#6b7280', 'fontSize': '12px'})
+])
 def parse_arguments():
     parser = argparse.ArgumentParser(
         description='Atlas Entraxes - Visualisation des altitudes maximales par département'
     )
     
+    # Défauts surchargeables par environnement (déploiement) tout en restant
+    # surchargeables en ligne de commande (développement)
     parser.add_argument(
-        '--port', 
-        type=int, 
-        default=8050,
-        help='Port du serveur (défaut: 8050)'
+        '--port',
+        type=int,
+        default=int(os.environ.get('ATLAS_PORT', '8050')),
+        help='Port du serveur (défaut: 8050, ou ATLAS_PORT)'
     )
-    
+
     parser.add_argument(
         '--host',
         type=str,
-        default='127.0.0.1',
-        help='Adresse d\'écoute (défaut: 127.0.0.1)'
+        default=os.environ.get('ATLAS_HOST', '127.0.0.1'),
+        help='Adresse d\'écoute (défaut: 127.0.0.1, ou ATLAS_HOST)'
     )
-    
+
     parser.add_argument(
         '--debug',
         action='store_true',
-        help='Active le mode debug'
+        default=os.environ.get('ATLAS_DEBUG', '0') == '1',
+        help='Active le mode debug (ou ATLAS_DEBUG=1)'
     )
     
     parser.add_argument(
@@ -68,394 +189,517 @@ def parse_arguments():
     return parser.parse_args()
 
 def setup_logging(quiet=False):
+    configure_logging("INFO")
     if quiet:
         warnings.filterwarnings("ignore", category=FutureWarning)
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
 
-def initialize_app(use_cache=True):
-    check_required_files()
+# Mémo en mémoire des CSV déjà parsés, clé (chemin, mtime) : les
+# ré-initialisations dans le même processus (rechargeur debug) ne repaient
+# ni le parse ni la lecture Parquet
+_CSV_CACHE = {}
+
 
-    geojson = json.loads(GEOJSON_PATH.read_text(encoding="utf-8"))
-    zones = pd.read_csv(ZONES_PATH, dtype=ZONES_DTYPES)
-    rules = pd.read_csv(RULES_PATH, dtype=RULES_DTYPES)
+def read_data_csv(path, dtype, usecols=None):
+    """Lit un CSV de données, avec cache Parquet et moteur PyArrow si disponibles.
 
-    details = pd.DataFrame()
-    details_lock = threading.Lock()
+    Au premier chargement le CSV est converti en Parquet à côté du fichier
+    source ; les démarrages suivants lisent la version colonne (types et
+    catégories déjà résolus), nettement plus rapide que le parse CSV.
+    Le résultat est aussi mémoïsé par (chemin, mtime) dans le processus.
 
+    Args:
+        usecols: Projection optionnelle — seules ces colonnes sont
+            tokenisées/chargées (le cache Parquet complet reste intact)
+    """
     try:
-        from config import DETAILS_PATH
-        if DETAILS_PATH.exists():
-            detail_dtypes = {
-                "Config": "string", "Type_Serre": "string", "Hauteur_Poteau": "string",
-                "Largeur": "string", "Toiture": "string", "Facade": "string", 
-                "Traverse": "string", "Materiau": "string", "Resistance_Vent": "string",
-                "Date_Creation": "string", "Version": "string"
+        cache_key = (str(path), path.stat().st_mtime_ns, usecols)
+    except OSError:
+        cache_key = None
+    if cache_key is not None and cache_key in _CSV_CACHE:
+        return _CSV_CACHE[cache_key]
+
+    df = _read_data_csv(path, dtype, usecols)
+    if cache_key is not None:
+        _CSV_CACHE[cache_key] = df
+    return df
+
+
+def _read_data_csv(path, dtype, usecols=None):
+    parquet_path = path.with_suffix(".parquet")
+    try:
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= path.stat().st_mtime:
+            df = pd.read_parquet(
+                parquet_path, columns=list(usecols) if usecols else None
+            )
+            # Arrow peut aplatir les colonnes catégorielles au rechargement :
+            # on réapplique les dtypes attendus si nécessaire
+            fix = {
+                c: t for c, t in dtype.items()
+                if c in df.columns and str(df[c].dtype) != str(t)
             }
-            details = pd.read_csv(DETAILS_PATH, dtype=detail_dtypes)
+            return df.astype(fix) if fix else df
+    except (ImportError, OSError, ValueError, KeyError):
+        pass
+
+    try:
+        df = pd.read_csv(path, dtype=dtype, usecols=usecols, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(path, dtype=dtype, usecols=usecols)
+
+    # Le cache Parquet n'est écrit que depuis une lecture complète, pour ne
+    # jamais remplacer le fichier par une version projetée
+    if usecols is None:
+        try:
+            df.to_parquet(parquet_path)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️ Impossible d'écrire le cache Parquet {parquet_path.name} : {e}")
+    return df
+
+def load_geojson():
+    """Charge le GeoJSON des départements, simplifié et mis en cache sur disque."""
+    use_cached = (
+        GEOJSON_SIMPLIFIED_PATH.exists()
+        and GEOJSON_SIMPLIFIED_PATH.stat().st_mtime >= GEOJSON_PATH.stat().st_mtime
+    )
+    path = GEOJSON_SIMPLIFIED_PATH if use_cached else GEOJSON_PATH
+
+    if HAS_ORJSON:
+        geojson = orjson.loads(path.read_bytes())
+    else:
+        geojson = json.loads(path.read_text(encoding="utf-8"))
+
+    if not use_cached:
+        simplified = simplify_geojson(geojson)
+        if simplified is not geojson:
+            geojson = simplified
+            try:
+                GEOJSON_SIMPLIFIED_PATH.write_text(
+                    json.dumps(geojson, separators=(",", ":")), encoding="utf-8"
+                )
+            except OSError as e:
+                print(f"⚠️ Impossible d'écrire le GeoJSON simplifié : {e}")
+
+    return geojson
+
+# Le GeoJSON est servi en statique par Dash (cache HTTP navigateur) et les
+# figures ne contiennent plus que cette URL au lieu d'embarquer les géométries
+_ASSETS_DIR = Path(__file__).parent / "assets"
+GEOJSON_ASSET_NAME = "departements_simplifie.geojson"
+GEOJSON_ASSET_URL = f"/assets/{GEOJSON_ASSET_NAME}"
+
+def publish_geojson_asset(geojson):
+    """Écrit le GeoJSON simplifié dans assets/ s'il est absent ou périmé."""
+    asset_path = _ASSETS_DIR / GEOJSON_ASSET_NAME
+    if asset_path.exists() and asset_path.stat().st_mtime >= GEOJSON_PATH.stat().st_mtime:
+        return
+    try:
+        _ASSETS_DIR.mkdir(exist_ok=True)
+        asset_path.write_text(
+            json.dumps(geojson, separators=(",", ":")), encoding="utf-8"
+        )
+    except OSError as e:
+        print(f"⚠️ Impossible de publier le GeoJSON dans assets/ : {e}")
+
+def load_details():
+    """Charge le fichier optionnel des détails de configuration."""
+    try:
+        from config import DETAILS_PATH, DETAILS_DTYPES
+        if DETAILS_PATH.exists():
+            # Seules la clé et les colonnes du panneau de détails sont
+            # utilisées : la projection évite de tokeniser le reste
+            usecols = ("Config",) + _DETAIL_FIELDS
+            detail_dtypes = {c: DETAILS_DTYPES[c] for c in usecols}
+            details = read_data_csv(DETAILS_PATH, detail_dtypes, usecols=usecols)
             print(f"✅ Détails chargés : {len(details)} configurations")
             print(f"📋 Configurations disponibles : {', '.join(details['Config'].unique())}")
-        else:
-            print(f"⚠️ Fichier de détails introuvable : {DETAILS_PATH}")
+            return details
+        print(f"⚠️ Fichier de détails introuvable : {DETAILS_PATH}")
     except Exception as e:
         print(f"❌ Erreur lors du chargement des détails : {e}")
-        details = pd.DataFrame()
+    return pd.DataFrame()
+
+def initialize_app(use_cache=True):
+    check_required_files()
+
+    # Les quatre chargements sont indépendants : lancés en parallèle, le temps
+    # de démarrage devient le max des latences au lieu de leur somme
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_geojson = ex.submit(load_geojson)
+        f_zones = ex.submit(read_data_csv, ZONES_PATH, ZONES_DTYPES)
+        f_rules = ex.submit(read_data_csv, RULES_PATH, RULES_DTYPES)
+        f_details = ex.submit(load_details)
+    geojson = f_geojson.result()
+    zones = f_zones.result()
+    rules = f_rules.result()
+    details = f_details.result()
+
+    publish_geojson_asset(geojson)
+
+    # Noms complétés une seule fois pour tout le monde : plus aucun fillna
+    # par combinaison lors de la construction des données de survol
+    zones["Nom"] = zones["Nom"].fillna("Nom manquant")
+
+    # Aligne les catégories des clés de jointure : la fusion zones × rules
+    # compare alors des codes entiers plutôt que des chaînes. Les catégories
+    # sont d'abord normalisées en chaînes, car selon le moteur de lecture les
+    # zones numériques ('1'…'5') peuvent être inférées en entiers d'un côté
+    # et rester des chaînes de l'autre, ce qui ferait échouer la jointure
+    for col in ("Zone_Vent", "Zone_Neige"):
+        z = zones[col].astype("string").astype("category")
+        r = rules[col].astype("string").astype("category")
+        categories = z.cat.categories.union(r.cat.categories)
+        zones[col] = z.cat.set_categories(categories)
+        rules[col] = r.cat.set_categories(categories)
+
+    # Détails indexés par configuration : construits une fois au chargement,
+    # plus de verrou ni de scan booléen du DataFrame à chaque callback
+    details_by_config = {}
+    if not details.empty and "Config" in details.columns:
+        cols = ["Config"] + [f for f in _DETAIL_FIELDS if f in details.columns]
+        uniques = details.drop_duplicates("Config", keep="first")[cols]
+        for row in uniques.itertuples(index=False):
+            values = row._asdict()
+            details_by_config[values.pop("Config")] = {
+                f: str(values[f]) if f in values and pd.notna(values[f]) and str(values[f]).strip() else "—"
+                for f in _DETAIL_FIELDS
+            }
 
     cent_df = compute_centroids(geojson)
 
+    # Numéros de départements : le contenu ne dépend pas de la combinaison
+    # sélectionnée, un seul calque texte est donc partagé par toutes les figures
+    dept_text_trace = None
+    if not cent_df.empty:
+        dept_text_trace = go.Scattergeo(
+            lat=cent_df["lat"],
+            lon=cent_df["lon"],
+            text=cent_df["Dept"],
+            mode="text",
+            textfont=dict(size=10, color="#1f2937", family="Inter"),
+            hoverinfo="skip",
+            showlegend=False,
+        )
+
     all_configs = sorted(rules["Config"].dropna().unique())
     all_entraxes = ["AltMax_3m", "AltMax_2_5m"]
 
+    # Fusion zones × règles réalisée une seule fois pour toutes les
+    # configurations : le produit cartésien départements × configurations
+    # garantit qu'aucun département ne disparaît (sémantique de la jointure
+    # gauche d'origine, absence de règle → Non admissible)
+    merged = zones.merge(
+        pd.DataFrame({"Config": pd.array(all_configs, dtype=rules["Config"].dtype)}),
+        how="cross",
+    ).merge(
+        rules[["Config", "Zone_Vent", "Zone_Neige", "AltMax_3m", "AltMax_2_5m"]],
+        on=["Config", "Zone_Vent", "Zone_Neige"], how="left",
+    )
+
+    # Valeurs numériques et libellés des deux entraxes calculés en vectoriel
+    # sur la table complète : une seule passe au lieu d'une par combinaison
+    for col in all_entraxes:
+        # downcast : float32 suffit largement pour des altitudes en mètres
+        vals = pd.to_numeric(merged[col], errors="coerce", downcast="float")
+        merged[f"{col}_num"] = vals
+        arr = vals.to_numpy(dtype=float)
+        mask = ~np.isnan(arr)
+        labels = np.full(arr.shape, "Non admissible", dtype=object)
+        if mask.any():
+            uniq, inverse = np.unique(arr[mask], return_inverse=True)
+            uniq_labels = np.array([_alt_label(int(v)) for v in uniq], dtype=object)
+            labels[mask] = uniq_labels[inverse]
+        merged[f"Label_{col}"] = labels
+
+    # Effectifs par (config, libellé) pour les statistiques : un seul
+    # value_counts groupé par passe au lieu d'un np.unique par clé
+    counts_by_key = {}
+    for col in all_entraxes:
+        grouped = merged.groupby("Config", sort=False, observed=True)[f"Label_{col}"].value_counts()
+        for (cfg, lab), n in grouped.items():
+            counts_by_key.setdefault((cfg, col), {})[lab] = int(n)
+
+    merged_by_config = {
+        cfg: sub.drop(columns="Config")
+        for cfg, sub in merged.groupby("Config", sort=False, observed=True)
+    }
+
     precomputed_data = {}
     precomputed_stats = {}
     precomputed_colors = {}
+    # Figures complètes (dict Plotly prêt à sérialiser) par (config, entraxe)
+    precomputed_figures = {}
 
-    if use_cache:
-        @functools.lru_cache(maxsize=16)
-        def get_color_palette_cached(labels_tuple):
-            return build_modern_color_palette(list(labels_tuple))
-
-        @functools.lru_cache(maxsize=50)
-        def create_base_choropleth_cached(config, entraxe_col, labels_tuple, df_hash):
-            key = (config, entraxe_col)
-            df = precomputed_data[key]
-            labels_order = list(labels_tuple)
-            cmap = get_color_palette_cached(labels_tuple)
-            
-            fig = px.choropleth(
-                df,
-                geojson=geojson,
-                locations="Dept",
-                featureidkey="properties.code",
-                color="Label",
-                category_orders={"Label": labels_order},
-                color_discrete_map=cmap,
-                hover_name="Nom",
-                hover_data={"Dept": True, "AltMax_sel": ":.0f"},
-            )
+    def create_base_choropleth_cached(config, entraxe_col):
+        key = (config, entraxe_col)
+        df = precomputed_data[key]
+        labels_order = precomputed_stats[key]['labels_order']
+        cmap = precomputed_colors[key]
 
-            fig.update_traces(
-                marker_line_color="#ffffff",
-                marker_line_width=0.5,
-                selector=dict(type="choropleth"),
-                hoverinfo="none",
-            )
-            
-            fig.update_geos(
-                showframe=False,
-                showcoastlines=False,
-                projection_type="mercator",
-                lonaxis_range=[-5.5, 9.5],
-                lataxis_range=[41.0, 51.5],
-                bgcolor='#ffffff',
-                showocean=True,
-                oceancolor='#ffffff',
-                showlakes=True,
-                lakecolor='#ffffff',
-                showland=True,
-                landcolor='#ffffff',
-                resolution=50
-            )
-            
-            fig.update_layout(
-                margin=dict(l=10, r=10, t=40, b=10),
-                plot_bgcolor='#ffffff',
-                paper_bgcolor='#ffffff',
-                height=None,
-                showlegend=True,
-                uirevision='constant',
-                autosize=True,
-                dragmode='pan',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=1.02,
-                    xanchor="center", 
-                    x=0.5,
-                    bgcolor="rgba(255,255,255,0.95)",
-                    bordercolor="#e2e8f0",
-                    borderwidth=1,
-                    font=dict(size=12, color="#1e293b")
-                )
-            )
-            
-            return fig
-
-        @functools.lru_cache(maxsize=100)
-        def get_detail_values_cached(config):
-            detail_values = {
-                "Type_Serre": "—",
-                "Hauteur_Poteau": "—", 
-                "Largeur": "—",
-                "Toiture": "—",
-                "Facade": "—",
-                "Traverse": "—"
-            }
+        fig = px.choropleth(
+            df,
+            geojson=GEOJSON_ASSET_URL,
+            locations="Dept",
+            featureidkey="properties.code",
+            color="Label",
+            category_orders={"Label": labels_order},
+            color_discrete_map=cmap,
+        )
 
-            with details_lock:
-                if not details.empty and "Config" in details.columns:
-                    matching_configs = details[details["Config"] == config]
-                    if not matching_configs.empty:
-                        config_row = matching_configs.iloc[0]
-                        for key in detail_values.keys():
-                            if key in config_row.index:
-                                value = config_row[key]
-                                if pd.notna(value) and str(value).strip() != "":
-                                    detail_values[key] = str(value)
-            
-            return detail_values
-
-        @functools.lru_cache(maxsize=10)
-        def get_usage_panel_cached():
-            return html.Div([
-                html.P("Calculs: Catégorie de terrain II (EN 13031)", style={'color': '#374151', 'margin': '0 0 6px 0'}),
-                html.P("Catégorie I: étude BE obligatoire", style={'color': '#b91c1c', 'fontWeight': '600', 'margin': '0 0 8px 0'}),
-                html.P("Altitude max = Vent × Neige pour la configuration affichée.", style={'color': '#6b7280', 'margin': '0 0 4px 0'}),
-                html.P("Outil d'aide commerciale — ne remplace pas une note de calcul.", style={'color': '#6b7280', 'margin': 0})
-            ])
-
-        @functools.lru_cache(maxsize=10)
-        def get_conditions_panel_cached():
-            return html.Div([
-                html.Div("Portée", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Carte d'aide à la vente indiquant l'altitude maximale admissible par département pour la configuration sélectionnée."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Hypothèses de calcul", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Norme EN 13031."),
-                    html.Li("Catégorie de terrain II (site relativement plat et dégagé)."),
-                    html.Li("Sans particularités locales ni corrections d'effet de site."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Définitions", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Altitude max: valeur indicative issue du croisement Zones Vent × Neige pour la configuration affichée."),
-                    html.Li("Non admissible: aucune règle ne permet un entraxe conforme pour cette configuration dans le département."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Cas non couverts / limites", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Catégorie de terrain I (sites très exposés: littoral, plateaux ouverts, etc.)."),
-                    html.Li("Relief marqué, couloirs de vent, bords de falaises, effets d'obstacles/bâtiments voisins."),
-                    html.Li("Microclimats, altitude du site élevée, règles locales particulières, matériaux/charges spécifiques."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Responsabilités", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Outil d'aide commerciale; ne remplace pas une note de calcul."),
-                    html.Li("En cas de doute, de site exposé (Cat. I) ou de condition non couverte, solliciter le bureau d'études avant toute offre."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Données et mise à jour", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Zones Vent/Neige selon sources en vigueur à la date de mise à jour indiquée."),
-                    html.Li("Les évolutions réglementaires peuvent modifier les résultats; vérifier la version la plus récente."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Avertissement important", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li(html.Span([html.Span("Catégorie I: ", style={'fontWeight': '700', 'color': '#b91c1c'}), "la carte n'est pas applicable; étude BE obligatoire avant toute décision."]))
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Dernière mise à jour: JJ/MM/AAAA", style={'marginTop': '10px', 'color': '#6b7280', 'fontSize': '12px'})
-            ])
-    else:
-        def get_color_palette_cached(labels_tuple):
-            return build_modern_color_palette(list(labels_tuple))
-
-        def create_base_choropleth_cached(config, entraxe_col, labels_tuple, df_hash):
-            key = (config, entraxe_col)
-            df = precomputed_data[key]
-            labels_order = list(labels_tuple)
-            cmap = get_color_palette_cached(labels_tuple)
-            
-            fig = px.choropleth(
-                df,
-                geojson=geojson,
-                locations="Dept",
-                featureidkey="properties.code",
-                color="Label",
-                category_orders={"Label": labels_order},
-                color_discrete_map=cmap,
-                hover_name="Nom",
-                hover_data={"Dept": True, "AltMax_sel": ":.0f"},
-            )
+        fig.update_traces(
+            marker_line_color="#ffffff",
+            marker_line_width=0.5,
+            selector=dict(type="choropleth"),
+            hoverinfo="none",
+        )
 
-            fig.update_traces(
-                marker_line_color="#ffffff",
-                marker_line_width=0.5,
-                selector=dict(type="choropleth"),
-                hoverinfo="none",
-            )
-            
-            fig.update_geos(
-                showframe=False,
-                showcoastlines=False,
-                projection_type="mercator",
-                lonaxis_range=[-5.5, 9.5],
-                lataxis_range=[41.0, 51.5],
-                bgcolor='#ffffff',
-                showocean=True,
-                oceancolor='#ffffff',
-                showlakes=True,
-                lakecolor='#ffffff',
-                showland=True,
-                landcolor='#ffffff',
-                resolution=50
-            )
-            
-            fig.update_layout(
-                margin=dict(l=10, r=10, t=40, b=10),
-                plot_bgcolor='#ffffff',
-                paper_bgcolor='#ffffff',
-                height=None,
-                showlegend=True,
-                uirevision='constant',
-                autosize=True,
-                dragmode='pan',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=1.02,
-                    xanchor="center", 
-                    x=0.5,
-                    bgcolor="rgba(255,255,255,0.95)",
-                    bordercolor="#e2e8f0",
-                    borderwidth=1,
-                    font=dict(size=12, color="#1e293b")
-                )
-            )
-            
-            return fig
-
-        def get_detail_values_cached(config):
-            detail_values = {
-                "Type_Serre": "—",
-                "Hauteur_Poteau": "—", 
-                "Largeur": "—",
-                "Toiture": "—",
-                "Facade": "—",
-                "Traverse": "—"
-            }
+        fig.update_geos(**_GEOS_CFG)
+        fig.update_layout(**_LAYOUT_CFG)
 
-            with details_lock:
-                if not details.empty and "Config" in details.columns:
-                    matching_configs = details[details["Config"] == config]
-                    if not matching_configs.empty:
-                        config_row = matching_configs.iloc[0]
-                        for key in detail_values.keys():
-                            if key in config_row.index:
-                                value = config_row[key]
-                                if pd.notna(value) and str(value).strip() != "":
-                                    detail_values[key] = str(value)
-            
-            return detail_values
-
-        def get_usage_panel_cached():
-            return html.Div([
-                html.P("Calculs: Catégorie de terrain II (EN 13031)", style={'color': '#374151', 'margin': '0 0 6px 0'}),
-                html.P("Catégorie I: étude BE obligatoire", style={'color': '#b91c1c', 'fontWeight': '600', 'margin': '0 0 8px 0'}),
-                html.P("Altitude max = Vent × Neige pour la configuration affichée.", style={'color': '#6b7280', 'margin': '0 0 4px 0'}),
-                html.P("Outil d'aide commerciale — ne remplace pas une note de calcul.", style={'color': '#6b7280', 'margin': 0})
-            ])
-
-        def get_conditions_panel_cached():
-            return html.Div([
-                html.Div("Portée", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Carte d'aide à la vente indiquant l'altitude maximale admissible par département pour la configuration sélectionnée."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Hypothèses de calcul", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Norme EN 13031."),
-                    html.Li("Catégorie de terrain II (site relativement plat et dégagé)."),
-                    html.Li("Sans particularités locales ni corrections d'effet de site."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Définitions", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Altitude max: valeur indicative issue du croisement Zones Vent × Neige pour la configuration affichée."),
-                    html.Li("Non admissible: aucune règle ne permet un entraxe conforme pour cette configuration dans le département."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Cas non couverts / limites", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Catégorie de terrain I (sites très exposés: littoral, plateaux ouverts, etc.)."),
-                    html.Li("Relief marqué, couloirs de vent, bords de falaises, effets d'obstacles/bâtiments voisins."),
-                    html.Li("Microclimats, altitude du site élevée, règles locales particulières, matériaux/charges spécifiques."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Responsabilités", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Outil d'aide commerciale; ne remplace pas une note de calcul."),
-                    html.Li("En cas de doute, de site exposé (Cat. I) ou de condition non couverte, solliciter le bureau d'études avant toute offre."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Données et mise à jour", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li("Zones Vent/Neige selon sources en vigueur à la date de mise à jour indiquée."),
-                    html.Li("Les évolutions réglementaires peuvent modifier les résultats; vérifier la version la plus récente."),
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Avertissement important", style={'fontWeight': '600', 'margin': '8px 0 4px 0', 'color': '#374151'}),
-                html.Ul([
-                    html.Li(html.Span([html.Span("Catégorie I: ", style={'fontWeight': '700', 'color': '#b91c1c'}), "la carte n'est pas applicable; étude BE obligatoire avant toute décision."]))
-                ], style={'margin': 0, 'paddingLeft': '18px'}),
-                html.Div("Dernière mise à jour: JJ/MM/AAAA", style={'marginTop': '10px', 'color': '#6b7280', 'fontSize': '12px'})
-            ])
+        return fig
+
+    def get_detail_values_cached(config):
+        return details_by_config.get(config, _DETAIL_DEFAULTS)
 
     def build_map_df(config: str, entraxe_col: str) -> pd.DataFrame:
-        sel = rules.loc[rules["Config"] == config, ["Zone_Vent", "Zone_Neige", entraxe_col]].copy()
-        if sel.empty:
+        base = merged_by_config.get(config)
+        if base is None:
             df = zones.copy()
             df["AltMax_sel"] = np.nan
             df["Label"] = "Non admissible"
             return df
-        m = zones.merge(sel, on=["Zone_Vent", "Zone_Neige"], how="left")
-        m["AltMax_sel"] = pd.to_numeric(m[entraxe_col], errors="coerce")
-        m["Label"] = m["AltMax_sel"].apply(lambda x: f"{int(x)} m" if pd.notna(x) else "Non admissible")
+        # Les colonnes numériques et de libellés sont déjà calculées sur la
+        # table fusionnée : simple projection + renommage
+        m = base[["Dept", "Nom", "Zone_Vent", "Zone_Neige"]].copy()
+        m["AltMax_sel"] = base[f"{entraxe_col}_num"].to_numpy()
+        m["Label"] = base[f"Label_{entraxe_col}"].to_numpy()
         return m
 
+    # Cache LRU appliqué conditionnellement, clé structurelle (config, entraxe) :
+    # deux chaînes internées, pas de tuple de labels à hacher, et maxsize exact
+    # pour que l'éviction LRU ne se déclenche jamais. build_map_df est pure et
+    # son résultat traité en lecture seule : la mémoïsation est sûre
+    if use_cache:
+        create_base_choropleth_cached = functools.lru_cache(
+            maxsize=len(all_configs) * len(all_entraxes)
+        )(create_base_choropleth_cached)
+        build_map_df = functools.lru_cache(maxsize=64)(build_map_df)
+
+    def _compute_one(config, entraxe):
+        df = build_map_df(config, entraxe)
+
+        # Effectifs déjà agrégés en une passe sur la table fusionnée
+        counts = dict(counts_by_key.get((config, entraxe), {}))
+        n_total = zones.shape[0]
+        n_non = counts.pop("Non admissible", 0)
+        n_adm = n_total - n_non
+
+        # Libellés du plus haut au plus bas, « Non admissible » en dernier
+        labels_order = sorted(counts, key=lambda lab: int(lab.split()[0]), reverse=True)
+        if n_non:
+            labels_order += ["Non admissible"]
+
+        cmap = build_modern_color_palette(labels_order)
+
+        p_adm = round(100 * n_adm / n_total) if n_total else 0
+        p_non = round(100 * n_non / n_total) if n_total else 0
+
+        stats = {
+            'labels_order': labels_order,
+            'n_total': n_total,
+            'n_adm': n_adm,
+            'p_adm': p_adm,
+            'counts': counts,
+            'n_non': n_non,
+            'p_non': p_non,
+            'no_match': n_adm == 0,
+            'df': df,
+            'hover_trace': None,
+        }
+
+        if not cent_df.empty:
+            labels_df = df.merge(cent_df, on="Dept", how="left")
+
+            # Grille 3×3 de points invisibles autour de chaque centroïde,
+            # construite en vectoriel (pas d'itération Python par ligne)
+            offsets = np.array([-0.2, 0.0, 0.2])
+            lat = labels_df["lat"].to_numpy(dtype=float)
+            lon = labels_df["lon"].to_numpy(dtype=float)
+            grid_lat = (lat[:, None] + np.repeat(offsets, 3)[None, :]).ravel()
+            grid_lon = (lon[:, None] + np.tile(offsets, 3)[None, :]).ravel()
+
+            # Texte de survol pré-assemblé : seules les parties variables
+            # (« Nom (Dept) » et le libellé) partent dans la figure, le
+            # balisage constant reste une seule fois dans le hovertemplate
+            hover = labels_df["Nom"].astype(str) + " (" + labels_df["Dept"].astype(str) + ")"
+            hover_text = np.repeat(hover.to_numpy(), 9).tolist()
+            hover_labels = np.repeat(labels_df["Label"].to_numpy(), 9).tolist()
+
+            stats['hover_trace'] = go.Scattergeo(
+                lat=grid_lat,
+                lon=grid_lon,
+                mode="markers",
+                marker=dict(size=20, color="rgba(0,0,0,0)"),
+                hovertemplate="<b>%{text}</b><br>Altitude max: %{customdata}<extra></extra>",
+                text=hover_text,
+                customdata=hover_labels,
+                showlegend=False,
+                hoverlabel=dict(
+                    bgcolor="#374151",
+                    font=dict(size=14, family="Tahoma", color="white")
+                )
+            )
+
+        return df, cmap, stats
+
     def precompute_all_data():
-        nonlocal precomputed_data, precomputed_stats, precomputed_colors
-        
+        nonlocal precomputed_data, precomputed_stats, precomputed_colors, precomputed_figures
+
         print("Pré-calcul des données...")
-        
-        for config in all_configs:
-            for entraxe in all_entraxes:
-                key = (config, entraxe)
-                
-                df = build_map_df(config, entraxe)
-                precomputed_data[key] = df
-                
-                vals = sorted(
-                    df.loc[df["Label"] != "Non admissible", "AltMax_sel"].dropna().unique().tolist(),
-                    reverse=True,
+
+        # Les combinaisons sont indépendantes : pandas relâche le GIL sur les
+        # fusions/opérations numériques, le pré-calcul scale donc avec les cœurs
+        keys = list(itertools.product(all_configs, all_entraxes))
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+            results = list(ex.map(lambda key: (key, _compute_one(*key)), keys))
+
+        # Écriture des dicts partagés sur le thread principal uniquement
+        for key, (df, cmap, stats) in results:
+            precomputed_data[key] = df
+            precomputed_colors[key] = cmap
+            precomputed_stats[key] = stats
+
+        # Figure complète (choroplèthe + calques + annotation) figée une fois
+        # pour toutes : le callback ne fait plus qu'un lookup
+        for config, entraxe in keys:
+            fig = create_base_choropleth_cached(config, entraxe)
+            stats = precomputed_stats[(config, entraxe)]
+            if dept_text_trace is not None:
+                fig.add_trace(dept_text_trace)
+            if stats['hover_trace'] is not None:
+                fig.add_trace(stats['hover_trace'])
+            if stats['no_match']:
+                fig.add_annotation(
+                    text="Aucune règle ne correspond à cette configuration.",
+                    x=0.5, y=0.5, xref="paper", yref="paper",
+                    showarrow=False,
+                    font=dict(size=16, color="#9a3412"),
+                    bgcolor="rgba(255,247,237,0.95)",
+                    bordercolor="#fdba74",
+                    borderwidth=1,
+                    borderpad=8
                 )
-                labels_order = [f"{int(v)} m" for v in vals]
-                if (df["Label"] == "Non admissible").any():
-                    labels_order += ["Non admissible"]
-                
-                cmap = get_color_palette_cached(tuple(labels_order))
-                precomputed_colors[key] = cmap
-                
-                n_total = zones.shape[0]
-                admissible = df[df["Label"] != "Non admissible"].copy()
-                n_adm = admissible.shape[0]
-                p_adm = round(100 * n_adm / n_total) if n_total else 0
-                counts = admissible["Label"].value_counts()
-                n_non = int((df["Label"] == "Non admissible").sum())
-                p_non = round(100 * n_non / n_total) if n_total else 0
-                
-                precomputed_stats[key] = {
-                    'labels_order': labels_order,
-                    'n_total': n_total,
-                    'n_adm': n_adm,
-                    'p_adm': p_adm,
-                    'counts': counts,
-                    'n_non': n_non,
-                    'p_non': p_non,
-                    'no_match': df["AltMax_sel"].isna().all(),
-                    'df': df
-                }
-        
+            precomputed_figures[(config, entraxe)] = fig.to_dict()
+
         print(f"Pré-calcul terminé : {len(precomputed_data)} combinaisons")
 
     precompute_all_data()
 
+    # Libellés affichés dans le panneau de détails, dans l'ordre
+    _DETAIL_ROWS = (
+        ("Type de serre", "Type_Serre"),
+        ("Hauteur de poteau", "Hauteur_Poteau"),
+        ("Largeur", "Largeur"),
+        ("Toiture", "Toiture"),
+        ("Façade", "Facade"),
+        ("Traverse", "Traverse"),
+    )
+
+    def _build_details_panel(config):
+        detail_values = get_detail_values_cached(config)
+
+        def row(label, value):
+            return _div([
+                _span(label, className="detail-label"),
+                _span(value, className="detail-value")
+            ], className="detail-row")
+
+        return _div(
+            [row("Référence du modèle", config or "—")]
+            + [row(label, detail_values[field]) for label, field in _DETAIL_ROWS]
+        )
+
+    # Panneaux de détails pré-construits : embarqués dans un dcc.Store et
+    # servis côté client sans repasser par le serveur
+    details_panels = {cfg: _build_details_panel(cfg) for cfg in all_configs}
+
+    # La légende ne dépend que de la combinaison sélectionnée : l'arbre de
+    # composants est construit une fois par clé puis resservi tel quel
+    def _build_legend(config, entraxe_col, stats, cmap):
+        labels_order = stats['labels_order']
+
+        legend_items = [
+            _div([
+                _div(className="legend-swatch", style={'backgroundColor': cmap[label]}),
+                _span(label, className="legend-label")
+            ], className="legend-item")
+            for label in labels_order
+        ]
+
+        legend_children = [
+            _div(
+                f"Configuration: {config} | Entraxe: {entraxe_col.replace('AltMax_', '').replace('m', ' m')}",
+                className="legend-title",
+            )
+        ]
+        if stats['no_match']:
+            legend_children.append(
+                _div("Aucune règle ne correspond à cette configuration.",
+                     className="legend-note")
+            )
+        legend_children.append(_div(legend_items, className="legend-items"))
+
+        return _div(legend_children, className="legend-box")
+
+    # Panneau de statistiques : même principe que la légende, construit une
+    # fois par clé puis servi tel quel
+    def _build_stats(stats, cmap):
+        labels_order = stats['labels_order']
+        
+        lines = []
+        for lab in labels_order:
+            if lab == "Non admissible":
+                continue
+            n = int(stats['counts'].get(lab, 0))
+            p = round(100 * n / stats['n_adm']) if stats['n_adm'] else 0
+            lines.append(
+                _div([
+                    _div(className="stats-swatch", style={'backgroundColor': cmap[lab]}),
+                    _div(lab, className="stats-label"),
+                    _div(f"{n} dép ({p}%)", className="stats-count")
+                ], className="stats-line")
+            )
+
+        bar_inner = _div(className="stats-bar-fill", style={'width': f"{stats['p_adm']}%"})
+        bar = _div([bar_inner], className="stats-bar")
+
+        return _div([
+            _div([
+                _span("Couverture", className="stats-header-label"),
+                _span(f"  {stats['n_adm']} / {stats['n_total']} dép ({stats['p_adm']}%)", className="stats-header-value")
+            ], className="stats-header"),
+            bar,
+            _div(lines, className="stats-lines"),
+            _div(f"Non admissibles: {stats['n_non']} dép ({stats['p_non']}% sur France)", className="stats-footer")
+        ])
+
+    # Cache complet par combinaison, embarqué dans un dcc.Store : la carte,
+    # la légende et les statistiques sont distribuées côté client sans
+    # aller-retour serveur
+    atlas_cache = {}
+    for (config, entraxe), stats in precomputed_stats.items():
+        cmap = precomputed_colors[(config, entraxe)]
+        atlas_cache[f"{config}|{entraxe}"] = {
+            "map": precomputed_figures[(config, entraxe)],
+            "legend": _build_legend(config, entraxe, stats, cmap),
+            "stats": _build_stats(stats, cmap),
+        }
+
     app = Dash(__name__)
     app.title = "Atlas Entraxes 2025"
 
     app.layout = html.Div([
+        dcc.Store(id="atlas-cache", data=atlas_cache),
         html.Div([
             html.H1("Atlas Entraxes", style={
                 'fontSize': '2rem',
@@ -566,13 +810,17 @@ def initialize_app(use_cache=True):
             html.Div([
                 html.H3("Détails configuration", style={'margin': '0 0 8px 0', 'fontSize': '16px', 'color': '#374151'}),
                 html.Div(id="details-panel", style={'marginBottom': '12px'}),
+                # Contenu des panneaux pré-calculés : l'arbre de composants
+                # part une seule fois avec le layout, plus aucun aller-retour
+                # HTTP lors des changements de configuration
+                dcc.Store(id="details-store", data=details_panels),
                 html.Details([
                     html.Summary("Règles d'usage", style={'cursor': 'pointer', 'fontWeight': '600', 'color': '#1f2937'}),
-                    html.Div(id="usage-panel", style={'marginTop': '8px'})
+                    html.Div(USAGE_PANEL, style={'marginTop': '8px'})
                 ], open=False),
                 html.Details([
                     html.Summary("Conditions d'utilisation (détaillées)", style={'cursor': 'pointer', 'fontWeight': '600', 'color': '#1f2937'}),
-                    html.Div(id="conditions-panel", style={'marginTop': '8px'})
+                    html.Div(CONDITIONS_PANEL, style={'marginTop': '8px'})
                 ], open=False)
             ], style={'width': '320px', 'minWidth': '260px', 'background': 'white', 'border': '1px solid #e2e8f0', 'borderRadius': '8px', 'padding': '12px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.05)'})
         ], style={'display': 'flex', 'gap': '12px'}),
@@ -584,248 +832,29 @@ def initialize_app(use_cache=True):
         'minHeight': '100vh'
     })
 
-    @app.callback(
-        Output("map", "figure"),
+    # Un seul dispatcher clientside pour la carte, la légende et les
+    # statistiques : la sélection ne déclenche plus aucune requête HTTP
+    app.clientside_callback(
+        "function(cfg, ent, cache) {"
+        " var v = cache[cfg + '|' + ent];"
+        " return [v.map, v.legend, v.stats];"
+        " }",
+        [Output("map", "figure"),
+         Output("legend-compact", "children"),
+         Output("stats-panel", "children")],
         Input("cfg", "value"),
         Input("entraxe", "value"),
+        State("atlas-cache", "data"),
     )
-    def update_map(config, entraxe_col):
-        key = (config, entraxe_col)
-        stats = precomputed_stats[key]
-        df = stats['df']
-        labels_order = stats['labels_order']
-        cmap = precomputed_colors[key]
-        
-        df_hash = hash(tuple(df['Label'].values))
-        fig = create_base_choropleth_cached(config, entraxe_col, tuple(labels_order), df_hash)
-        
-        if not cent_df.empty:
-            labels_df = df.merge(cent_df, on="Dept", how="left")
-            fig.add_trace(
-                go.Scattergeo(
-                    lat=labels_df["lat"],
-                    lon=labels_df["lon"],
-                    text=labels_df["Dept"],
-                    mode="text",
-                    textfont=dict(size=10, color="#1f2937", family="Inter"),
-                    hoverinfo="skip",
-                    showlegend=False,
-                )
-            )
-
-        if not cent_df.empty:
-            df_clean = df.copy()
-            df_clean["Nom"] = df_clean["Nom"].fillna("Nom manquant")
-            df_clean["Label"] = df_clean["Label"].fillna("Non disponible")
-            
-            hover_df = df_clean.merge(cent_df, on="Dept", how="left")
-            hover_points = []
-            for _, row in hover_df.iterrows():
-                for lat_offset in [-0.2, 0, 0.2]:
-                    for lon_offset in [-0.2, 0, 0.2]:
-                        hover_points.append({
-                            'lat': row['lat'] + lat_offset,
-                            'lon': row['lon'] + lon_offset,
-                            'Nom': row['Nom'],
-                            'Dept': row['Dept'],
-                            'Label': row['Label']
-                        })
-            
-            hover_df_expanded = pd.DataFrame(hover_points)
-            fig.add_trace(
-                go.Scattergeo(
-                    lat=hover_df_expanded["lat"],
-                    lon=hover_df_expanded["lon"],
-                    mode="markers",
-                    marker=dict(size=20, color="rgba(0,0,0,0)"),
-                    hovertemplate="<b>%{customdata[0]} (%{customdata[1]})</b><br>Altitude max: %{customdata[2]}<extra></extra>",
-                    customdata=np.stack([hover_df_expanded["Nom"], hover_df_expanded["Dept"], hover_df_expanded["Label"]], axis=-1),
-                    showlegend=False,
-                    hoverlabel=dict(
-                        bgcolor="#374151",
-                        font=dict(size=14, family="Tahoma", color="white")
-                    )
-                )
-            )
-
-        if stats['no_match']:
-            fig.add_annotation(
-                text="Aucune règle ne correspond à cette configuration.",
-                x=0.5, y=0.5, xref="paper", yref="paper",
-                showarrow=False,
-                font=dict(size=16, color="#9a3412"),
-                bgcolor="rgba(255,247,237,0.95)",
-                bordercolor="#fdba74",
-                borderwidth=1,
-                borderpad=8
-            )
-
-        return fig
 
-    @app.callback(
-        Output("legend-compact", "children"),
-        Input("cfg", "value"),
-        Input("entraxe", "value"),
-    )
-    def update_legend(config, entraxe_col):
-        key = (config, entraxe_col)
-        stats = precomputed_stats[key]
-        cmap = precomputed_colors[key]
-        labels_order = stats['labels_order']
-        
-        legend_items = []
-        for label in labels_order:
-            legend_items.append(
-                html.Div([
-                    html.Div(style={
-                        'width': '20px',
-                        'height': '20px',
-                        'backgroundColor': cmap[label],
-                        'borderRadius': '4px',
-                        'display': 'inline-block',
-                        'marginRight': '8px',
-                        'verticalAlign': 'middle',
-                        'border': '1px solid #e2e8f0',
-                        'flexShrink': '0'
-                    }),
-                    html.Span(label, style={
-                        'fontSize': '14px',
-                        'fontWeight': '500',
-                        'color': '#374151',
-                        'verticalAlign': 'middle',
-                        'whiteSpace': 'nowrap'
-                    })
-                ], style={
-                    'display': 'inline-flex',
-                    'alignItems': 'center',
-                    'marginRight': '20px',
-                    'marginBottom': '8px'
-                })
-            )
-
-        notif = None
-        if stats['no_match']:
-            notif = html.Div(
-                "Aucune règle ne correspond à cette configuration.",
-                style={
-                    'background': '#fff7ed',
-                    'color': '#9a3412',
-                    'border': '#fdba74 1px solid',
-                    'borderRadius': '6px',
-                    'padding': '10px',
-                    'marginBottom': '10px',
-                    'textAlign': 'center',
-                    'fontWeight': '600'
-                }
-            )
-
-        legend_children = [
-            html.Div(f"Configuration: {config} | Entraxe: {entraxe_col.replace('AltMax_', '').replace('m', ' m')}", style={
-                'fontSize': '14px',
-                'color': '#6b7280',
-                'marginBottom': '10px',
-                'fontWeight': '500',
-                'textAlign': 'center'
-            })
-        ]
-        if notif is not None:
-            legend_children.append(notif)
-        legend_children.append(
-            html.Div(legend_items, style={
-                'display': 'flex',
-                'flexWrap': 'wrap',
-                'alignItems': 'center',
-                'justifyContent': 'center'
-            })
-        )
-        
-        return html.Div(legend_children, style={
-            'background': 'white',
-            'padding': '15px',
-            'borderRadius': '8px',
-            'boxShadow': '0 2px 4px rgba(0,0,0,0.1)',
-            'border': '1px solid #e2e8f0',
-            'marginTop': '15px',
-            'position': 'relative',
-            'zIndex': '10',
-            'width': '100%',
-            'boxSizing': 'border-box'
-        })
-
-    @app.callback(
-        Output("stats-panel", "children"),
-        Input("cfg", "value"),
-        Input("entraxe", "value"),
-    )
-    def update_stats(config, entraxe_col):
-        key = (config, entraxe_col)
-        stats = precomputed_stats[key]
-        cmap = precomputed_colors[key]
-        labels_order = stats['labels_order']
-        
-        lines = []
-        for lab in labels_order:
-            if lab == "Non admissible":
-                continue
-            n = int(stats['counts'].get(lab, 0))
-            p = round(100 * n / stats['n_adm']) if stats['n_adm'] else 0
-            lines.append(
-                html.Div([
-                    html.Div(style={'width': '10px', 'height': '10px', 'backgroundColor': cmap[lab], 'borderRadius': '2px', 'border': '1px solid #e5e7eb', 'marginRight': '8px'}),
-                    html.Div(lab, style={'flex': '1', 'color': '#374151'}),
-                    html.Div(f"{n} dép ({p}%)", style={'color': '#6b7280'})
-                ], style={'display': 'flex', 'alignItems': 'center', 'gap': '6px', 'padding': '6px 0', 'borderBottom': '1px solid #f1f5f9'})
-            )
-
-        bar_inner = html.Div(style={'width': f"{stats['p_adm']}%", 'height': '8px', 'background': '#2563eb', 'borderRadius': '999px'})
-        bar = html.Div([bar_inner], style={'height': '8px', 'background': '#f1f5f9', 'borderRadius': '999px'})
-
-        return html.Div([
-            html.Div([
-                html.Span("Couverture", style={'fontWeight': '600', 'color': '#374151'}),
-                html.Span(f"  {stats['n_adm']} / {stats['n_total']} dép ({stats['p_adm']}%)", style={'float': 'right', 'color': '#1f2937'})
-            ], style={'marginBottom': '6px'}),
-            bar,
-            html.Div(lines, style={'marginTop': '10px'}),
-            html.Div(f"Non admissibles: {stats['n_non']} dép ({stats['p_non']}% sur France)", style={'marginTop': '8px', 'color': '#6b7280'})
-        ])
-
-    @app.callback(
+    # Mise à jour des détails entièrement côté client : simple indexation du
+    # Store pré-rempli, aucun aller-retour serveur par changement de config
+    app.clientside_callback(
+        "function(cfg, panels) { return panels[cfg] || null; }",
         Output("details-panel", "children"),
         Input("cfg", "value"),
+        State("details-store", "data"),
     )
-    def update_details(config):
-        detail_values = get_detail_values_cached(config)
-        
-        def row(label, value):
-            return html.Div([
-                html.Span(label, style={'color': '#6b7280'}),
-                html.Span(value, style={'fontWeight': '600', 'color': '#1f2937'})
-            ], style={'display': 'flex', 'justifyContent': 'space-between', 'padding': '6px 0', 'borderBottom': '1px solid #f1f5f9'})
-
-        return html.Div([
-            row("Référence du modèle", config or "—"),
-            row("Type de serre", detail_values["Type_Serre"]),
-            row("Hauteur de poteau", detail_values["Hauteur_Poteau"]),
-            row("Largeur", detail_values["Largeur"]),
-            row("Toiture", detail_values["Toiture"]),
-            row("Façade", detail_values["Facade"]),
-            row("Traverse", detail_values["Traverse"]),
-        ])
-
-    @app.callback(
-        Output("usage-panel", "children"),
-        Input("cfg", "value"),
-    )
-    def update_usage(config):
-        return get_usage_panel_cached()
-
-    @app.callback(
-        Output("conditions-panel", "children"),
-        Input("cfg", "value"),
-    )
-    def update_conditions(config):
-        return get_conditions_panel_cached()
 
     return app
 
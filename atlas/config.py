@@ -6,93 +6,207 @@ nécessaires au bon fonctionnement de l'application.
 """
 
 from pathlib import Path
+import functools
+import hashlib
 import logging
+import os
+import stat
+import time
 
 logger = logging.getLogger(__name__)
 
-# Chemins des fichiers de données
-DATA_DIR = Path(__file__).parent / "data"
+# Taille maximale acceptée pour un fichier de données : la comparaison se
+# fait en octets, la conversion en MB n'a lieu que pour les messages
+MAX_FILE_SIZE_MB = 100
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB << 20
+
+# Chemins des fichiers de données, résolus en absolu une fois à l'import :
+# les chemins dérivés restent valables quel que soit le répertoire courant
+# et aucun appel ultérieur ne repaie de résolution
+DATA_DIR = Path(__file__).resolve().parent / "data"
 
 GEOJSON_PATH = DATA_DIR / "departements.geojson"
+# Version simplifiée, générée et mise en cache au premier démarrage
+GEOJSON_SIMPLIFIED_PATH = DATA_DIR / "departements_simplifie.geojson"
 ZONES_PATH = DATA_DIR / "dept_zones_NORMALISE.csv"
 RULES_PATH = DATA_DIR / "results_by_combo.csv"
 DETAILS_PATH = DATA_DIR / "details.csv"
 
+# Fichiers indispensables au démarrage, avec leur description pour les
+# messages d'erreur. Tuple figé construit une seule fois à l'import
+_REQUIRED_FILES = (
+    (GEOJSON_PATH, "données géographiques des départements"),
+    (ZONES_PATH, "zones réglementaires par département"),
+    (RULES_PATH, "règles de calcul principales"),
+)
+
 # Types de données pour la cohérence pandas
-ZONES_DTYPES = {
-    "Dept": "string",
-    "Nom": "string", 
-    "Zone_Vent": "string",
-    "Zone_Neige": "string"
+# Les colonnes à faible cardinalité (zones, configurations) sont stockées en
+# "category" : comparaisons et jointures sur codes entiers plutôt que chaînes.
+# Les dicts sont construits à la première demande (PEP 562) puis mis en cache
+# dans globals() : les consommateurs qui n'importent que les chemins ou le
+# logging ne paient pas leur construction
+_LAZY_ATTRS = {
+    "ZONES_DTYPES": lambda: {
+        "Dept": "category",
+        "Nom": "string",
+        "Zone_Vent": "category",
+        "Zone_Neige": "category"
+    },
+    "RULES_DTYPES": lambda: {
+        "Config": "category",
+        "Zone_Vent": "category",
+        "Zone_Neige": "category",
+        "AltMax_3m": "string",
+        "AltMax_2_5m": "string"
+    },
+    # Les attributs descriptifs ont une cardinalité minuscule (quelques
+    # valeurs répétées sur toutes les configurations) : "category" les stocke
+    # sur codes entiers. Config reste "string" (clé de recherche)
+    "DETAILS_DTYPES": lambda: {
+        "Config": "string",
+        "Type_Serre": "category",
+        "Hauteur_Poteau": "category",
+        "Largeur": "category",
+        "Toiture": "category",
+        "Facade": "category",
+        "Traverse": "category",
+        "Materiau": "category",
+        "Resistance_Vent": "category",
+        "Date_Creation": "string",
+        "Version": "category"
+    },
 }
 
-RULES_DTYPES = {
-    "Config": "string",
-    "Zone_Vent": "string",
-    "Zone_Neige": "string",
-    "AltMax_3m": "string",
-    "AltMax_2_5m": "string"
-}
 
-DETAILS_DTYPES = {
-    "Config": "string",
-    "Type_Serre": "string",
-    "Hauteur_Poteau": "string",
-    "Largeur": "string",
-    "Toiture": "string",
-    "Facade": "string",
-    "Traverse": "string",
-    "Materiau": "string",
-    "Resistance_Vent": "string",
-    "Date_Creation": "string",
-    "Version": "string"
-}
+def __getattr__(name):
+    try:
+        factory = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = factory()
+    return value
+
+
+# Empreinte de la dernière validation réussie, persistée entre processus :
+# si (nom, taille, mtime_ns) des fichiers n'ont pas bougé, la boucle de
+# validation est sautée au démarrage suivant
+VALIDATION_CACHE_PATH = Path.home() / ".cache" / "atlas" / "validated.hash"
+
+
+def _validate_file(entry, file_path):
+    """Valide un fichier de données (présence, type, lisibilité, taille).
+
+    Retourne un message d'erreur, ou None si le fichier est valide : pas
+    d'exception levée puis rattrapée par fichier dans le chemin nominal.
+    """
+    if entry is None:
+        return f"Fichier introuvable : {file_path}"
 
+    st = entry.stat()
+    if not stat.S_ISREG(st.st_mode):
+        return f"Le chemin n'est pas un fichier : {file_path}"
 
-def check_required_files():
+    # entry.path est déjà une chaîne : pas de dispatch __fspath__ sur le Path
+    if not os.access(entry.path, os.R_OK):
+        return f"Impossible de lire le fichier : {file_path}"
+
+    if st.st_size > MAX_FILE_SIZE_BYTES:
+        return f"Fichier trop volumineux : {st.st_size / (1024 * 1024):.1f} MB"
+
+    return None
+
+
+def _fingerprint_entries(entries):
+    """Empreinte blake2b des (nom, taille, mtime_ns) des fichiers de données."""
+    items = sorted((name, e.stat().st_size, e.stat().st_mtime_ns)
+                   for name, e in entries.items())
+    return hashlib.blake2b(repr(items).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def check_required_files(preload=False):
     """
     Vérifie que tous les fichiers requis sont présents et accessibles.
-    
+
+    Le résultat est mémoïsé par processus : le rechargeur de Dash en mode
+    debug (et les tests) ré-invoquent cette fonction, inutile de refaire
+    les accès disque. `check_required_files.cache_clear()` force une
+    revalidation.
+
+    Args:
+        preload: Si True, lit aussi le contenu des fichiers pendant la
+            validation et retourne (chemins, {chemin: octets}) — les
+            lecteurs en aval peuvent alors réutiliser le tampon au lieu
+            de rouvrir le fichier
+
+    Returns:
+        Tuple des chemins validés (et le dict des contenus si preload)
+
     Raises:
         FileNotFoundError: Si un fichier requis est manquant
     """
-    logger.info("Démarrage de la validation des fichiers requis...")
-    
-    required_files = [
-        (GEOJSON_PATH, "données géographiques des départements"),
-        (ZONES_PATH, "zones réglementaires par département"), 
-        (RULES_PATH, "règles de calcul principales")
-    ]
+    # Déploiements conteneurisés : les données validées à la construction de
+    # l'image n'ont pas besoin d'être revalidées à chaque démarrage
+    if os.environ.get("ATLAS_SKIP_VALIDATION") == "1":
+        logger.info("Validation des fichiers sautée (ATLAS_SKIP_VALIDATION=1)")
+        paths = tuple(file_path for file_path, _ in _REQUIRED_FILES)
+        if preload:
+            return paths, {p: p.read_bytes() for p in paths}
+        return paths
+
+    logger.debug("Démarrage de la validation des fichiers requis...")
+    start = time.perf_counter()
     
     validation_errors = []
-    
-    for file_path, description in required_files:
+    total_bytes = 0
+    preloaded = {}
+
+    # Un seul parcours du répertoire de données : les DirEntry renvoyés par
+    # scandir portent un stat déjà mis en cache, aucun appel système
+    # supplémentaire par fichier
+    expected_names = {p.name for p, _ in _REQUIRED_FILES}
+    entries = {}
+    try:
+        with os.scandir(DATA_DIR) as it:
+            for entry in it:
+                if entry.name in expected_names:
+                    entries[entry.name] = entry
+    except FileNotFoundError:
+        pass  # répertoire absent : chaque fichier sera signalé manquant
+
+    # Court-circuit : si l'empreinte du répertoire correspond à celle de la
+    # dernière validation réussie, les fichiers n'ont pas changé
+    fingerprint = None
+    if len(entries) == len(expected_names):
+        fingerprint = _fingerprint_entries(entries)
         try:
-            if not file_path.exists():
-                raise FileNotFoundError(f"Fichier introuvable : {file_path}")
-            
-            if not file_path.is_file():
-                raise FileNotFoundError(f"Le chemin n'est pas un fichier : {file_path}")
-            
-            # Test d'accès en lecture
-            try:
-                with open(file_path, 'rb') as f:
-                    f.read(1)
-            except PermissionError as e:
-                raise PermissionError(f"Impossible de lire le fichier : {e}")
-            
-            # Validation de la taille (max 100MB)
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
-            if file_size_mb > 100:
-                raise ValueError(f"Fichier trop volumineux : {file_size_mb:.1f} MB")
-            
-            logger.info(f"Fichier {description} validé avec succès : {file_path}")
-            logger.info(f"Taille du fichier '{file_path.name}' validée : {file_size_mb:.1f} MB")
-            logger.info(f"✓ {description} : OK")
-            
-        except (FileNotFoundError, PermissionError, ValueError) as e:
-            validation_errors.append(str(e))
-            logger.error(f"✗ {description} : ERREUR - {e}")
+            if VALIDATION_CACHE_PATH.read_text() == fingerprint:
+                logger.debug("Empreinte de validation inchangée, vérification sautée")
+                paths = tuple(file_path for file_path, _ in _REQUIRED_FILES)
+                if preload:
+                    return paths, {p: p.read_bytes() for p in paths}
+                return paths
+        except OSError:
+            pass  # pas d'empreinte en cache : validation complète
+
+    for file_path, description in _REQUIRED_FILES:
+        entry = entries.get(file_path.name)
+        error = _validate_file(entry, file_path)
+        if error is not None:
+            validation_errors.append(error)
+            logger.error("✗ %s : ERREUR - %s", description, error)
+            continue
+
+        st = entry.stat()
+        total_bytes += st.st_size
+        if preload:
+            # Lecture fusionnée avec la validation : une seule ouverture,
+            # le tampon est resservi aux lecteurs en aval
+            with open(entry.path, 'rb') as f:
+                preloaded[file_path] = f.read()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✓ %s (%.1f MB) : %s", description, st.st_size / (1024 * 1024), file_path)
     
     if validation_errors:
         error_summary = (
@@ -102,21 +216,52 @@ def check_required_files():
         logger.critical(error_summary)
         raise FileNotFoundError(error_summary)
     
-    logger.info(f"✅ Validation réussie ! {len(required_files)} fichier(s) validé(s).")
+    elapsed_ms = (time.perf_counter() - start) * 1e3
+    logger.info(
+        "✅ Validation réussie : %d fichier(s), %.1f MB, %.1f ms",
+        len(_REQUIRED_FILES), total_bytes / (1024 * 1024), elapsed_ms
+    )
+
+    if fingerprint is not None:
+        try:
+            VALIDATION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            VALIDATION_CACHE_PATH.write_text(fingerprint)
+        except OSError as e:
+            logger.debug("Empreinte de validation non persistée : %s", e)
+
+    paths = tuple(file_path for file_path, _ in _REQUIRED_FILES)
+    if preload:
+        return paths, preloaded
+    return paths
+
+
+_LOGGING_READY = False
 
 
 def setup_logging(level="INFO"):
-    """Configure le système de logging pour l'application."""
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
-    
-    logging.basicConfig(
-        level=numeric_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    logger.info(f"Logging configuré au niveau {level}")
+    """Configure le système de logging pour l'application.
+
+    Appelé explicitement par le point d'entrée de l'application plutôt qu'à
+    l'import du module : importer config ne doit ni coûter une installation
+    de handlers ni écraser la configuration d'un hôte déjà en place.
+
+    Le handler est installé manuellement une seule fois (drapeau de module) :
+    les appels suivants retournent sans prendre le verrou du logger racine,
+    contrairement à logging.basicConfig qui le reprend à chaque invocation.
+    """
+    global _LOGGING_READY
+    if _LOGGING_READY:
+        return
 
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        root.addHandler(handler)
+        root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-# Configuration automatique du logging
-setup_logging("INFO")
\ No newline at end of file
+    _LOGGING_READY = True
+    logger.info("Logging configuré au niveau %s", level)
\ No newline at end of file
@@ -6,17 +6,31 @@ Normalise les données et lance l'application web.
 """
 
 import sys
+from pathlib import Path
+
+def _needs_normalization():
+    """Vrai si le CSV normalisé est absent ou plus vieux que l'Excel source."""
+    data_dir = Path(__file__).resolve().parent / "data"
+    xlsx = data_dir / "dept_zones.xlsx"
+    out = data_dir / "dept_zones_NORMALISE.csv"
+    if not xlsx.exists():
+        return False  # pas de source : on compte sur un CSV déjà en place
+    return not out.exists() or out.stat().st_mtime < xlsx.stat().st_mtime
 
 def main():
     """Lance la normalisation des données puis l'application."""
-    # Normalisation des données
-    try:
-        from scripts.normalize_dept_zones import main as normalize
-        normalize()
-        print("Normalisation réussie")
-    except Exception as e:
-        print(f"Attention - Normalisation échouée : {e}")
-        print("L'application peut fonctionner si les données sont déjà normalisées")
+    # Normalisation des données — sautée (import du script et de pandas
+    # compris) quand le CSV normalisé est déjà à jour
+    if _needs_normalization():
+        try:
+            from scripts.normalize_dept_zones import main as normalize
+            normalize()
+            print("Normalisation réussie")
+        except Exception as e:
+            print(f"Attention - Normalisation échouée : {e}")
+            print("L'application peut fonctionner si les données sont déjà normalisées")
+    else:
+        print("Données déjà normalisées, étape sautée")
     
     # Lancement de l'application
     try:
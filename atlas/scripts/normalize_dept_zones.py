@@ -40,12 +40,15 @@ def load_excel_data() -> pd.DataFrame:
         raise FileNotFoundError(f"Fichier Excel introuvable : {XLSX}")
     
     try:
+        # Un seul classeur ouvert : la vérification de la feuille et la
+        # lecture passent par le même handle, au lieu de rematérialiser
+        # toutes les cellules une seconde fois via pd.read_excel(XLSX)
         with pd.ExcelFile(XLSX) as xls:
             if SHEET_NAME not in xls.sheet_names:
                 available_sheets = ", ".join(xls.sheet_names)
                 raise ValueError(f"Feuille '{SHEET_NAME}' introuvable. Feuilles disponibles : {available_sheets}")
-        
-        df = pd.read_excel(XLSX, sheet_name=SHEET_NAME, dtype={"Code_Dept": "string"})
+
+            df = xls.parse(sheet_name=SHEET_NAME, dtype={"Code_Dept": "string"})
         logger.info(f"Données lues avec succès : {len(df)} lignes")
         return df
     except Exception as e:
@@ -66,14 +69,14 @@ def validate_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     
     logger.info(f"Structure validée : {len(df)} lignes, {len(df.columns)} colonnes")
     
-    # Nettoyage des données
+    # Nettoyage des données : conversion et strip en un seul passage par
+    # colonne, directement sur le DataFrame fraîchement lu (aucun autre
+    # consommateur, la copie défensive était inutile)
     logger.info("Nettoyage des données...")
-    df_clean = df.copy()
-    df_clean["Code_Dept"] = df_clean["Code_Dept"].astype("string").str.strip()
-    df_clean["Nom_Departement"] = df_clean["Nom_Departement"].astype("string").str.strip()
-    df_clean["Zone_Vent_Max"] = df_clean["Zone_Vent_Max"].astype("string").str.strip()
-    df_clean["Zone_Neige_Max"] = df_clean["Zone_Neige_Max"].astype("string").str.strip()
-    
+    df_clean = df
+    for col in ("Code_Dept", "Nom_Departement", "Zone_Vent_Max", "Zone_Neige_Max"):
+        df_clean[col] = df_clean[col].astype("string").str.strip()
+
     # Vérification des codes départements problématiques
     null_codes = df_clean["Code_Dept"].isnull().sum()
     empty_codes = df_clean["Code_Dept"].eq("").sum()
@@ -88,20 +91,23 @@ def create_normalized_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Crée le DataFrame normalisé au format requis par l'application."""
     logger.info("Création du DataFrame normalisé...")
     
+    # mask/isin : un seul test vectorisé d'appartenance au lieu du parcours
+    # valeur par valeur du dict de replace()
+    neige = df["Zone_Neige_Max"]
     norm = pd.DataFrame({
         "Dept": df["Code_Dept"],
         "Nom": df["Nom_Departement"],
         "Zone_Vent": df["Zone_Vent_Max"],
-        "Zone_Neige": df["Zone_Neige_Max"].replace(NEIGE_NORMALIZE_VALUES),
+        "Zone_Neige": neige.mask(neige.isin(NEIGE_NORMALIZE_VALUES), ""),
     })
     
-    # Statistiques de normalisation
-    original_neige_values = df["Zone_Neige_Max"].value_counts()
-    normalized_neige_values = norm["Zone_Neige"].value_counts()
-    
     logger.info(f"DataFrame normalisé créé : {len(norm)} lignes")
-    logger.info(f"Valeurs Zone_Neige avant : {original_neige_values.to_dict()}")
-    logger.info(f"Valeurs Zone_Neige après : {normalized_neige_values.to_dict()}")
+
+    # Statistiques de normalisation : les deux value_counts (tri + hachage)
+    # ne sont calculés que si le niveau DEBUG les affichera
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Valeurs Zone_Neige avant : {df['Zone_Neige_Max'].value_counts().to_dict()}")
+        logger.debug(f"Valeurs Zone_Neige après : {norm['Zone_Neige'].value_counts().to_dict()}")
     
     return norm
 
@@ -114,23 +120,49 @@ def save_normalized_csv(norm: pd.DataFrame) -> None:
     OUT.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        norm.to_csv(OUT, index=False, encoding="utf-8")
-        
+        # Écriture via PyArrow quand disponible : formatage natif multi-thread
+        # au lieu du writer Python cellule par cellule de pandas
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            pacsv.write_csv(pa.Table.from_pandas(norm, preserve_index=False), OUT)
+        except ImportError:
+            norm.to_csv(OUT, index=False, encoding="utf-8")
+
         if not OUT.exists():
             raise IOError(f"Le fichier de sortie n'a pas été créé : {OUT}")
-        
+
         file_size = OUT.stat().st_size
         logger.info(f"Sauvegarde réussie : {file_size} octets")
     except Exception as e:
         raise IOError(f"Erreur lors de la sauvegarde : {e}")
 
+    # Écriture du frère Parquet dès la normalisation : l'application le
+    # préfère au CSV quand il est plus récent, et son premier démarrage
+    # saute entièrement le parse texte. Optionnel : sans moteur Parquet,
+    # le CSV reste la source de vérité
+    try:
+        parquet_out = OUT.with_suffix(".parquet")
+        norm.to_parquet(parquet_out)
+        logger.info(f"Cache Parquet écrit : {parquet_out.name}")
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning(f"Cache Parquet non écrit : {e}")
+
 
 def main() -> bool:
     """Fonction principale de normalisation des données départementales."""
     logger.info("=== DÉBUT DE LA NORMALISATION DES DONNÉES DÉPARTEMENTALES ===")
     logger.info(f"Fichier source : {XLSX}")
     logger.info(f"Fichier destination : {OUT}")
-    
+
+    # Court-circuit : si le CSV de sortie est plus récent que l'Excel
+    # source, tout le pipeline (openpyxl + pandas) est sauté — un simple
+    # stat au lieu d'environ une seconde de re-parse
+    if XLSX.exists() and OUT.exists() and OUT.stat().st_mtime >= XLSX.stat().st_mtime:
+        logger.info("CSV normalisé déjà à jour, normalisation sautée")
+        print(f"✅ Déjà à jour : {OUT}")
+        return True
+
     try:
         # Chargement des données
         df = load_excel_data()
@@ -7,8 +7,18 @@ Transforme le fichier Excel source en format CSV compatible avec l'application.
 import pandas as pd
 import sys
 import logging
+import tempfile
 from pathlib import Path
 
+# Conversion streaming xlsx → csv si xlsx2csv est installé : le parse SAX
+# évite de matérialiser le DOM du classeur, puis read_csv va à la vitesse
+# du disque. Optionnel : repli sur openpyxl sinon
+try:
+    from xlsx2csv import Xlsx2csv
+    HAS_XLSX2CSV = True
+except ImportError:
+    HAS_XLSX2CSV = False
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -39,8 +49,31 @@ def load_excel_data() -> pd.DataFrame:
     if not XLSX.exists():
         raise FileNotFoundError(f"Fichier Excel introuvable : {XLSX}")
     
+    if HAS_XLSX2CSV:
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".csv") as tmp:
+                converter = Xlsx2csv(str(XLSX), outputencoding="utf-8")
+                sheet_id = converter.getSheetIdByName(SHEET_NAME)
+                if sheet_id is None:
+                    raise ValueError(f"Feuille '{SHEET_NAME}' introuvable")
+                converter.convert(tmp.name, sheetid=sheet_id)
+                df = pd.read_csv(tmp.name, dtype={"Code_Dept": "string"})
+            logger.info(f"Données lues avec succès (xlsx2csv) : {len(df)} lignes")
+            return df
+        except Exception as e:
+            logger.warning(f"Conversion xlsx2csv échouée, repli openpyxl : {e}")
+
     try:
-        df = pd.read_excel(XLSX, sheet_name=SHEET_NAME, dtype={"Code_Dept": "string"})
+        # Moteur explicite : pas de détection de format ni de repli sur un
+        # autre lecteur pour un .xlsx connu. La vérification de la feuille et
+        # la lecture partagent le même handle : un seul parse du classeur
+        with pd.ExcelFile(XLSX, engine="openpyxl") as xls:
+            if SHEET_NAME not in xls.sheet_names:
+                available_sheets = ", ".join(xls.sheet_names)
+                raise ValueError(
+                    f"Feuille '{SHEET_NAME}' introuvable. Feuilles disponibles : {available_sheets}"
+                )
+            df = xls.parse(sheet_name=SHEET_NAME, dtype={"Code_Dept": "string"})
         logger.info(f"Données lues avec succès : {len(df)} lignes")
         return df
     except Exception as e:
@@ -60,14 +93,15 @@ def validate_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     
     logger.info(f"Structure validée : {len(df)} lignes, {len(df.columns)} colonnes")
     
-    # Nettoyage des données
+    # Nettoyage des données, directement sur le DataFrame fraîchement lu :
+    # l'appelant ne réutilise jamais la version brute, la copie défensive
+    # doublait la mémoire pour rien
     logger.info("Nettoyage des données...")
-    df_clean = df.copy()
-    df_clean["Code_Dept"] = df_clean["Code_Dept"].astype("string").str.strip()
-    df_clean["Nom_Departement"] = df_clean["Nom_Departement"].astype("string").str.strip()
-    df_clean["Zone_Vent_Max"] = df_clean["Zone_Vent_Max"].astype("string").str.strip()
-    df_clean["Zone_Neige_Max"] = df_clean["Zone_Neige_Max"].astype("string").str.strip()
-    
+    df_clean = df
+    for col in ("Code_Dept", "Nom_Departement", "Zone_Vent_Max", "Zone_Neige_Max"):
+        df_clean[col] = df_clean[col].astype("string").str.strip()
+
+
     logger.info("Nettoyage terminé")
     return df_clean
 
@@ -76,20 +110,23 @@ def create_normalized_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Crée le DataFrame normalisé au format requis par l'application."""
     logger.info("Création du DataFrame normalisé...")
     
+    # mask/isin : un seul test vectorisé d'appartenance au lieu du parcours
+    # valeur par valeur du dict de replace()
+    neige = df["Zone_Neige_Max"]
     norm = pd.DataFrame({
         "Dept": df["Code_Dept"],
         "Nom": df["Nom_Departement"],
         "Zone_Vent": df["Zone_Vent_Max"],
-        "Zone_Neige": df["Zone_Neige_Max"].replace(NEIGE_NORMALIZE_VALUES),
+        "Zone_Neige": neige.mask(neige.isin(NEIGE_NORMALIZE_VALUES), ""),
     })
     
-    # Statistiques de normalisation
-    original_neige_values = df["Zone_Neige_Max"].value_counts()
-    normalized_neige_values = norm["Zone_Neige"].value_counts()
-    
     logger.info(f"DataFrame normalisé créé : {len(norm)} lignes")
-    logger.info(f"Valeurs Zone_Neige avant : {original_neige_values.to_dict()}")
-    logger.info(f"Valeurs Zone_Neige après : {normalized_neige_values.to_dict()}")
+
+    # Statistiques de normalisation : les deux value_counts (tri + hachage)
+    # ne sont calculés que si le niveau DEBUG les affichera
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Valeurs Zone_Neige avant : {df['Zone_Neige_Max'].value_counts().to_dict()}")
+        logger.debug(f"Valeurs Zone_Neige après : {norm['Zone_Neige'].value_counts().to_dict()}")
     
     return norm
 
@@ -102,7 +139,14 @@ def save_normalized_csv(norm: pd.DataFrame) -> None:
     OUT.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        norm.to_csv(OUT, index=False, encoding="utf-8")
+        # Écriture via PyArrow quand disponible : formatage natif multi-thread
+        # au lieu du writer Python cellule par cellule de pandas
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            pacsv.write_csv(pa.Table.from_pandas(norm, preserve_index=False), OUT)
+        except ImportError:
+            norm.to_csv(OUT, index=False, encoding="utf-8")
         file_size = OUT.stat().st_size
         logger.info(f"Sauvegarde réussie : {file_size} octets")
     except Exception as e:
@@ -7,6 +7,7 @@ Teste rapidement les calculs d'altitude pour une configuration donnée.
 import sys
 import logging
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 logging.basicConfig(
@@ -31,27 +32,58 @@ ZONES_DTYPES = {
     "Zone_Vent": "string", "Zone_Neige": "string"
 }
 
+# Altitudes déclarées numériques dès la lecture : le parse str → float a
+# lieu une seule fois dans le tokeniseur CSV, plus de pd.to_numeric en aval
 RULES_DTYPES = {
     "Config": "string", "Zone_Vent": "string", "Zone_Neige": "string",
-    "AltMax_3m": "string", "AltMax_2_5m": "string"
+    "AltMax_3m": "Float64", "AltMax_2_5m": "Float64"
 }
 
 # Configurations d'entraxe à tester
 ENTRAXE_CONFIGS = [("AltMax_3m", "3.00 m"), ("AltMax_2_5m", "2.50 m")]
 
 
+def read_csv_cached(path, dtype):
+    """Lit un CSV avec cache Parquet à côté du fichier source.
+
+    Même mécanisme que l'application : si un frère .parquet plus récent
+    existe, il est lu directement (types déjà résolus, pas de tokenisation) ;
+    sinon le CSV est parsé puis le cache écrit pour la prochaine fois.
+    """
+    parquet_path = path.with_suffix(".parquet")
+    try:
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= path.stat().st_mtime:
+            df = pd.read_parquet(parquet_path)
+            # Le cache peut avoir été écrit avec d'autres dtypes (catégories
+            # de l'application) : on réapplique ceux attendus ici
+            fix = {
+                c: t for c, t in dtype.items()
+                if c in df.columns and str(df[c].dtype) != str(t)
+            }
+            return df.astype(fix) if fix else df
+    except (ImportError, OSError, ValueError):
+        pass
+
+    df = pd.read_csv(path, dtype=dtype)
+    try:
+        df.to_parquet(parquet_path)
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning(f"Cache Parquet non écrit pour {path.name} : {e}")
+    return df
+
+
 def load_data_files():
     """Charge les fichiers de données CSV."""
     logger.info("Chargement des fichiers de données...")
-    
+
     if not ZONES_FILE.exists():
         raise FileNotFoundError(f"Fichier zones introuvable : {ZONES_FILE}")
     if not RULES_FILE.exists():
         raise FileNotFoundError(f"Fichier règles introuvable : {RULES_FILE}")
-    
+
     try:
-        dz = pd.read_csv(ZONES_FILE, dtype=ZONES_DTYPES)
-        rb = pd.read_csv(RULES_FILE, dtype=RULES_DTYPES)
+        dz = read_csv_cached(ZONES_FILE, ZONES_DTYPES)
+        rb = read_csv_cached(RULES_FILE, RULES_DTYPES)
         
         if dz.empty or rb.empty:
             raise ValueError("Un des fichiers de données est vide")
@@ -67,20 +99,22 @@ def process_entraxe_configuration(dz, config_rules, entraxe_col, config, label):
     """Traite une configuration d'entraxe spécifique."""
     logger.info(f"Traitement de l'entraxe {label} pour la configuration {config}...")
     
-    # Sélection des règles pour cette entraxe
-    sel = config_rules.loc[:, ["Zone_Vent", "Zone_Neige", entraxe_col]].copy()
-    
+    # Sélection des règles pour cette entraxe : config_rules est déjà indexé
+    # par (Zone_Vent, Zone_Neige), la projection suffit
+    sel = config_rules[[entraxe_col]]
+
     if sel.empty:
         logger.warning(f"Aucune règle trouvée pour {config} - {label}")
         print(f"[{label}] aucune règle pour {config}")
         return None
+
+    # Jointure zones ↔ règles sur l'index trié des règles
+    m = dz.merge(sel, left_on=["Zone_Vent", "Zone_Neige"], right_index=True, how="left")
     
-    # Jointure zones ↔ règles
-    m = dz.merge(sel, on=["Zone_Vent", "Zone_Neige"], how="left")
-    
-    # Calcul des altitudes et statuts
-    m["AltMax_sel"] = pd.to_numeric(m[entraxe_col], errors="coerce")
-    m["Statut"] = m["AltMax_sel"].apply(lambda x: "Admissible" if pd.notna(x) else "Non admissible")
+    # Calcul des altitudes et statuts : la colonne est déjà Float64 depuis la
+    # lecture, et np.where remplace l'apply par un passage vectorisé unique
+    m["AltMax_sel"] = m[entraxe_col]
+    m["Statut"] = np.where(m["AltMax_sel"].notna(), "Admissible", "Non admissible")
     
     logger.info(f"Calculs terminés pour {label} : {len(m)} départements traités")
     return m
@@ -116,11 +150,27 @@ def main(config=CONFIG, show_lines=SHOW):
     try:
         # Chargement des données
         dz, rb = load_data_files()
-        
-        # Recherche des règles pour la configuration
-        config_rules = rb.loc[rb["Config"] == config].copy()
+
+        # Clés de jointure en catégories partagées : la fusion compare des
+        # codes entiers au lieu de re-hacher les chaînes de zones. Les deux
+        # côtés sont d'abord normalisés en chaînes pour garantir des
+        # catégories identiques quel que soit le chemin de chargement
+        for col in ("Zone_Vent", "Zone_Neige"):
+            z = dz[col].astype("string").astype("category")
+            r = rb[col].astype("string").astype("category")
+            categories = z.cat.categories.union(r.cat.categories)
+            dz[col] = z.cat.set_categories(categories)
+            rb[col] = r.cat.set_categories(categories)
+
+        # Recherche des règles pour la configuration : index trié une fois,
+        # puis sélection O(log N) par .xs au lieu d'un scan complet par config
+        rb_idx = rb.set_index(["Config", "Zone_Vent", "Zone_Neige"]).sort_index()
+        try:
+            config_rules = rb_idx.xs(config, level="Config")
+        except KeyError:
+            config_rules = rb_idx.iloc[0:0].droplevel("Config")
         logger.info(f"Règles trouvées pour '{config}' : {len(config_rules)}")
-        
+
         if config_rules.empty:
             available_configs = sorted(rb["Config"].dropna().unique().tolist())
             logger.warning(f"Configuration '{config}' introuvable")
@@ -5,16 +5,21 @@ Ce module fournit les outils nécessaires pour les calculs géographiques
 et la génération des palettes de couleurs pour la visualisation.
 """
 
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List
 
 logger = logging.getLogger(__name__)
 
 # Test de disponibilité de Shapely pour les calculs géographiques
 try:
-    from shapely.geometry import shape
+    from shapely.geometry import shape, mapping
     HAS_SHAPELY = True
     logger.info("Shapely disponible pour les calculs géographiques")
 except ImportError:
@@ -102,6 +107,56 @@ def compute_centroids(geojson: Dict[str, Any]) -> pd.DataFrame:
     return centroids_df
 
 
+def simplify_geojson(geojson: Dict[str, Any], tolerance: float = 0.01) -> Dict[str, Any]:
+    """
+    Simplifie les géométries d'un GeoJSON (Douglas-Peucker).
+
+    À l'échelle nationale de la carte, les sommets en dessous de ~0.01° sont
+    invisibles : les supprimer réduit fortement le poids des figures envoyées
+    au navigateur sans perte visuelle.
+
+    Args:
+        geojson: Dictionnaire GeoJSON contenant les géométries des départements
+        tolerance: Tolérance de simplification en degrés
+
+    Returns:
+        Nouveau dictionnaire GeoJSON aux géométries simplifiées
+        (le GeoJSON d'origine est retourné tel quel si Shapely est absent)
+    """
+    if not HAS_SHAPELY:
+        logger.warning("Shapely non disponible - simplification ignorée")
+        return geojson
+
+    if not geojson or "features" not in geojson:
+        logger.error("GeoJSON invalide ou vide")
+        return geojson
+
+    logger.info(f"Simplification des géométries (tolérance {tolerance}°)...")
+
+    features = []
+    simplified = 0
+
+    for feature in geojson["features"]:
+        geometry = feature.get("geometry")
+        if not geometry:
+            features.append(feature)
+            continue
+
+        try:
+            geom = shape(geometry).simplify(tolerance, preserve_topology=True)
+            new_feature = dict(feature)
+            new_feature["geometry"] = mapping(geom)
+            features.append(new_feature)
+            simplified += 1
+        except Exception as e:
+            logger.warning(f"Erreur simplification géométrie : {e}")
+            features.append(feature)
+
+    logger.info(f"Simplification terminée : {simplified} géométries traitées")
+
+    return {**geojson, "features": features}
+
+
 def build_modern_color_palette(labels_order: List[str]) -> Dict[str, str]:
     """
     Génère une palette de couleurs moderne pour la visualisation.